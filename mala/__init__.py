@@ -30,6 +30,7 @@ from .datahandling import (
 )
 from .network import (
     Network,
+    build_network,
     Tester,
     Trainer,
     HyperOpt,
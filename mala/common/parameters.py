@@ -270,6 +270,65 @@ class ParametersNetwork(ParametersBase):
         Number of heads to be used in Multi head attention network
         This should be a divisor of input dimension
         Default: None
+
+    use_jit : bool
+        If True, the layer stack of feed-forward networks is compiled
+        with TorchScript. This fuses the per-layer Python calls into one
+        graph call, which mainly pays off for small networks evaluated
+        at high frequency. Default: False
+
+    use_fused_layers : bool
+        If True, each Linear/activation pair of a feed-forward network
+        is built as one fused module, halving the number of module
+        dispatches per forward pass and letting compilers fuse the
+        activation into the matrix multiplication. Note that this
+        changes the layout of saved networks, so checkpoints are only
+        compatible between runs with the same setting. Default: False
+
+    inplace_activations : bool
+        If True (default), activations that support it (ReLU,
+        LeakyReLU) are applied in-place in feed-forward networks,
+        saving one allocation and one full write of the activation
+        tensor per layer. Safe there because each activation directly
+        follows a linear layer whose pre-activation output is not
+        reused. Set to False to restore out-of-place activations.
+
+    use_batched_layers : bool
+        If True, runs of equal-width hidden layers with the same
+        activation in a feed-forward network are built as one block
+        with stacked (depth, width, width) weights instead of
+        individual layers. This allows compilers to execute the run as
+        batched matrix multiplications with a single dispatch. Like
+        use_fused_layers, this changes the layout of saved networks.
+        Default: False
+
+    precision : string
+        Working precision of the forward pass on GPU. Supported are
+
+            - "fp32" (default): full single precision
+            - "bf16": forward passes run under torch.autocast in
+              bfloat16
+            - "fp16": forward passes run under torch.autocast in half
+              precision; training additionally requires a gradient
+              scaler
+
+        The 16 bit formats halve the memory traffic of the forward pass
+        and engage the tensor cores on recent GPUs. Ignored on CPU.
+
+    use_compile : bool
+        If True, the forward pass is compiled with torch.compile
+        (reduce-overhead mode), letting inductor fuse pointwise
+        operations and batch independent linear layers. The first
+        forward call per input shape triggers compilation and is
+        correspondingly slow; this pays off for long training or
+        inference runs. Requires torch >= 2.0. Default: False
+
+    use_cuda_graphs : bool
+        If True, repeated inference through Network.do_prediction with
+        a fixed input shape is captured into a CUDA graph and replayed,
+        replacing the per-layer kernel launches with a single launch.
+        Requires all inputs of one shape to be on the GPU and the
+        network to be shape-stable. Default: False
     """
 
     def __init__(self):
@@ -278,6 +337,13 @@ class ParametersNetwork(ParametersBase):
         self.layer_sizes = [10, 10, 10]
         self.layer_activations = ["Sigmoid"]
         self.loss_function_type = "mse"
+        self.use_jit = False
+        self.inplace_activations = True
+        self.use_fused_layers = False
+        self.use_batched_layers = False
+        self.precision = "fp32"
+        self.use_compile = False
+        self.use_cuda_graphs = False
 
         # for LSTM/Gru + Transformer
         self.num_hidden_layers = 1
@@ -1,14 +1,18 @@
 """Gaussian descriptor class."""
 
+import concurrent.futures
+from functools import lru_cache, partial
+import math
 import os
 
 import ase
 import ase.io
 from importlib.util import find_spec
 import numpy as np
-from scipy.spatial import distance
+from scipy.spatial import cKDTree, distance
 
 from mala.common.parallelizer import printout
+from mala.common.parameters import DEFAULT_NP_DATA_DTYPE
 from mala.descriptors.lammps_utils import extract_compute_np
 from mala.descriptors.descriptor import Descriptor
 
@@ -19,6 +23,394 @@ from mala.descriptors.descriptor import Descriptor
 optimal_sigma_aluminium = 0.2
 reference_grid_spacing_aluminium = 0.08099000022712448
 
+# Maximum number of grid point/atom pairs for which the dense,
+# BLAS-backed distance matrix path is used in the python descriptor
+# calculation. Beyond that, a KDTree query is used, which only
+# materializes pairs within the cutoff radius. 2^26 float64 pairs
+# correspond to a 512 MB distance matrix.
+dense_pair_limit = 2**26
+
+
+def _compute_gaussian_slab(
+    grid_coords, all_atoms, cutoff, prefactor, argumentfactor
+):
+    """
+    Compute Gaussian descriptor values for a slab of grid points.
+
+    Selects between the dense cdist path (small slabs, one BLAS-backed
+    call) and the KDTree path (large slabs, memory proportional to the
+    pairs within the cutoff). Defined at module level so slabs can be
+    dispatched to worker processes.
+
+    Parameters
+    ----------
+    grid_coords : numpy.array
+        Coordinates of the grid points in this slab, shape (N, 3).
+
+    all_atoms : numpy.array
+        Positions of all potentially relevant atoms, shape (M, 3).
+
+    cutoff : float
+        Cutoff radius beyond which atoms do not contribute.
+
+    prefactor : float
+        Normalization prefactor of the Gaussians.
+
+    argumentfactor : float
+        Factor 1/(2*sigma^2) in the Gaussian argument.
+
+    Returns
+    -------
+    gaussians : numpy.array
+        Summed Gaussian contributions per grid point, shape (N,).
+    """
+    cutoff_squared = cutoff * cutoff
+    if grid_coords.shape[0] * np.shape(all_atoms)[0] <= dense_pair_limit:
+        # For small systems, computing the full squared distance
+        # matrix with one cdist call is faster than building KDTrees;
+        # the "sqeuclidean" metric maps onto a single fused BLAS
+        # matrix multiplication.
+        dm = distance.cdist(grid_coords, all_atoms, "sqeuclidean")
+        within_cutoff = dm < cutoff_squared
+        contributions = prefactor * np.exp(
+            -dm * argumentfactor,
+            out=np.zeros_like(dm),
+            where=within_cutoff,
+        )
+        return contributions.sum(axis=1)
+    else:
+        # For larger systems, a single KDTree query keeps the memory
+        # footprint proportional to the number of pairs within the
+        # cutoff radius instead of the full grid-times-atoms product.
+        # all_atoms already contains the periodic images relevant
+        # within the cutoff, so no periodic wrapping is needed here.
+        atom_tree = cKDTree(all_atoms)
+        grid_tree = cKDTree(grid_coords)
+        dm = grid_tree.sparse_distance_matrix(
+            atom_tree, cutoff, output_type="coo_matrix"
+        )
+        contributions = prefactor * np.exp(
+            -(dm.data * dm.data) * argumentfactor
+        )
+        return np.bincount(
+            dm.row, weights=contributions, minlength=grid_coords.shape[0]
+        )
+
+
+def _bin_atoms(atom_positions, cutoff):
+    """
+    Sort atoms into a cell-linked bin structure with bin size cutoff.
+
+    With bins as large as the cutoff radius, all atoms within the cutoff
+    of a given point are guaranteed to lie in the 27 bins surrounding
+    the bin holding that point, so kernels only have to visit those
+    instead of the full atom list.
+
+    Parameters
+    ----------
+    atom_positions : numpy.array
+        Positions of all (potentially relevant) atoms, shape (N, 3).
+
+    cutoff : float
+        Cutoff radius, used as the bin edge length.
+
+    Returns
+    -------
+    sorted_positions : numpy.array
+        Atom positions reordered so that each bin holds a contiguous
+        slice.
+
+    bin_starts : numpy.array
+        CSR-style offsets into sorted_positions; bin b holds the atoms
+        in sorted_positions[bin_starts[b]:bin_starts[b + 1]].
+
+    bin_dimensions : numpy.array
+        Number of bins along each axis.
+
+    origin : numpy.array
+        Position of the lower corner of the bin grid.
+    """
+    origin = np.min(atom_positions, axis=0)
+    bin_indices = np.floor((atom_positions - origin) / cutoff).astype(np.int64)
+    bin_dimensions = np.max(bin_indices, axis=0) + 1
+    flat_bin_indices = (
+        bin_indices[:, 0] * bin_dimensions[1] + bin_indices[:, 1]
+    ) * bin_dimensions[2] + bin_indices[:, 2]
+    order = np.argsort(flat_bin_indices)
+    sorted_positions = np.ascontiguousarray(atom_positions[order])
+    number_of_bins = int(np.prod(bin_dimensions))
+    bin_starts = np.zeros(number_of_bins + 1, dtype=np.int64)
+    np.cumsum(
+        np.bincount(flat_bin_indices, minlength=number_of_bins),
+        out=bin_starts[1:],
+    )
+    return sorted_positions, bin_starts, bin_dimensions, origin
+
+
+# The JIT-compiled Gaussian kernels (exact and approximated exp) are
+# built lazily, so that numba stays an optional dependency (same as
+# LAMMPS).
+@lru_cache(maxsize=None)
+def _get_numba_gaussian_kernel(sigma, cutoff, use_fast_exp=False):
+    """
+    Build (once) and return a numba-compiled Gaussian kernel.
+
+    The kernel evaluates, for each grid point, the sum of Gaussian
+    contributions of all atoms within the cutoff radius. Atoms are
+    accessed through the cell-linked bin structure built by _bin_atoms,
+    so each grid point only visits its 27 surrounding bins. The kernel
+    is compiled with parallel=True, so the loop over grid points is
+    distributed across all available threads.
+
+    The kernel is specialized to one (sigma, cutoff) pair: all derived
+    quantities (prefactor, argument factor, squared cutoff) enter the
+    compiled code as closure constants, so numba folds them into the
+    instruction stream instead of loading them per pair. lru_cache
+    reuses the specialized kernel across frames with the same
+    parameters.
+
+    Parameters
+    ----------
+    sigma : float
+        Width of the Gaussians.
+
+    cutoff : float
+        Cutoff radius beyond which atoms do not contribute. Also the
+        bin edge length of the bin structure the kernel expects.
+
+    use_fast_exp : bool
+        If True, exp(-x) is evaluated with polynomial coefficients from
+        _fast_exp_coefficients via a Horner chain of fused
+        multiply-adds, which vectorizes over SIMD lanes, instead of a
+        libm call per pair. Arguments beyond the fitted domain
+        contribute zero.
+
+    Returns
+    -------
+    kernel : callable
+        The compiled kernel, called as kernel(grid_coords,
+        sorted_positions, bin_starts, bin_dimensions, origin, out).
+        May only be called with contiguous arrays.
+    """
+    from numba import njit, prange
+
+    prefactor = 1.0 / (np.power(sigma * np.sqrt(2 * np.pi), 3))
+    argumentfactor = 1.0 / (2.0 * sigma * sigma)
+    cutoff_squared = cutoff * cutoff
+    inv_cutoff = 1.0 / cutoff
+
+    if use_fast_exp:
+        x_max = min(cutoff_squared * argumentfactor, _fast_exp_domain_max)
+        coefficients = _fast_exp_coefficients(x_max)
+        degree = coefficients.shape[0] - 1
+
+        @njit(parallel=True, fastmath=True)
+        def kernel(
+            grid_coords,
+            sorted_positions,
+            bin_starts,
+            bin_dimensions,
+            origin,
+            out,
+        ):
+            for g in prange(grid_coords.shape[0]):
+                x = grid_coords[g, 0]
+                y = grid_coords[g, 1]
+                z = grid_coords[g, 2]
+                bin_x = int(math.floor((x - origin[0]) * inv_cutoff))
+                bin_y = int(math.floor((y - origin[1]) * inv_cutoff))
+                bin_z = int(math.floor((z - origin[2]) * inv_cutoff))
+                summed = 0.0
+                for bx in range(
+                    max(bin_x - 1, 0),
+                    min(bin_x + 2, bin_dimensions[0]),
+                ):
+                    for by in range(
+                        max(bin_y - 1, 0),
+                        min(bin_y + 2, bin_dimensions[1]),
+                    ):
+                        for bz in range(
+                            max(bin_z - 1, 0),
+                            min(bin_z + 2, bin_dimensions[2]),
+                        ):
+                            b = (bx * bin_dimensions[1] + by) * bin_dimensions[
+                                2
+                            ] + bz
+                            for a in range(bin_starts[b], bin_starts[b + 1]):
+                                dx = x - sorted_positions[a, 0]
+                                dy = y - sorted_positions[a, 1]
+                                dz = z - sorted_positions[a, 2]
+                                distance_squared = dx * dx + dy * dy + dz * dz
+                                if distance_squared < cutoff_squared:
+                                    arg = distance_squared * argumentfactor
+                                    if arg < x_max:
+                                        value = coefficients[degree]
+                                        for c in range(degree - 1, -1, -1):
+                                            value = (
+                                                value * arg + coefficients[c]
+                                            )
+                                        summed += value
+                out[g] = prefactor * summed
+
+    else:
+
+        @njit(parallel=True, fastmath=True)
+        def kernel(
+            grid_coords,
+            sorted_positions,
+            bin_starts,
+            bin_dimensions,
+            origin,
+            out,
+        ):
+            for g in prange(grid_coords.shape[0]):
+                x = grid_coords[g, 0]
+                y = grid_coords[g, 1]
+                z = grid_coords[g, 2]
+                bin_x = int(math.floor((x - origin[0]) * inv_cutoff))
+                bin_y = int(math.floor((y - origin[1]) * inv_cutoff))
+                bin_z = int(math.floor((z - origin[2]) * inv_cutoff))
+                summed = 0.0
+                for bx in range(
+                    max(bin_x - 1, 0),
+                    min(bin_x + 2, bin_dimensions[0]),
+                ):
+                    for by in range(
+                        max(bin_y - 1, 0),
+                        min(bin_y + 2, bin_dimensions[1]),
+                    ):
+                        for bz in range(
+                            max(bin_z - 1, 0),
+                            min(bin_z + 2, bin_dimensions[2]),
+                        ):
+                            b = (bx * bin_dimensions[1] + by) * bin_dimensions[
+                                2
+                            ] + bz
+                            for a in range(bin_starts[b], bin_starts[b + 1]):
+                                dx = x - sorted_positions[a, 0]
+                                dy = y - sorted_positions[a, 1]
+                                dz = z - sorted_positions[a, 2]
+                                distance_squared = dx * dx + dy * dy + dz * dz
+                                if distance_squared < cutoff_squared:
+                                    summed += math.exp(
+                                        -distance_squared * argumentfactor
+                                    )
+                out[g] = prefactor * summed
+
+    return kernel
+
+
+# Parameters of the polynomial approximation of exp(-x) used by the
+# fast-exp variant of the Gaussian kernel. Beyond the domain maximum,
+# exp(-x) < 7e-6 and contributions are treated as zero.
+_fast_exp_degree = 12
+_fast_exp_domain_max = 12.0
+
+
+def _fast_exp_coefficients(x_max, degree=_fast_exp_degree):
+    """
+    Fit a polynomial approximation to exp(-x) on the interval [0, x_max].
+
+    The fit interpolates at the Chebyshev points of the interval, which
+    keeps the maximum error close to that of the minimax polynomial.
+
+    Parameters
+    ----------
+    x_max : float
+        Upper end of the fitted interval.
+
+    degree : int
+        Degree of the fitted polynomial.
+
+    Returns
+    -------
+    coefficients : numpy.array
+        Power-basis coefficients in ascending order, for evaluation via
+        a Horner chain.
+    """
+    chebyshev_fit = np.polynomial.Chebyshev.interpolate(
+        lambda x: np.exp(-x), degree, domain=[0.0, x_max]
+    )
+    return chebyshev_fit.convert(kind=np.polynomial.Polynomial).coef
+
+
+# Number of threads per block for the CUDA Gaussian kernel; also the
+# size of the shared-memory tile of atom positions.
+_cuda_block_size = 128
+
+_numba_cuda_gaussian_kernel = None
+
+
+def _get_numba_cuda_gaussian_kernel():
+    """
+    Build (once) and return the CUDA version of the Gaussian kernel.
+
+    One thread is launched per grid point. Atom positions are staged
+    through shared memory in tiles, so that all threads of a block reuse
+    each loaded position.
+
+    Returns
+    -------
+    kernel : callable
+        The compiled CUDA kernel. Must be launched with _cuda_block_size
+        threads per block.
+    """
+    global _numba_cuda_gaussian_kernel
+    if _numba_cuda_gaussian_kernel is None:
+        from numba import cuda, float64
+
+        @cuda.jit
+        def kernel(
+            grid_coords,
+            atom_positions,
+            cutoff_squared,
+            prefactor,
+            argumentfactor,
+            out,
+        ):
+            shared_positions = cuda.shared.array(
+                (_cuda_block_size, 3), float64
+            )
+            g = cuda.grid(1)
+            thread = cuda.threadIdx.x
+            number_of_atoms = atom_positions.shape[0]
+
+            x = 0.0
+            y = 0.0
+            z = 0.0
+            if g < grid_coords.shape[0]:
+                x = grid_coords[g, 0]
+                y = grid_coords[g, 1]
+                z = grid_coords[g, 2]
+
+            summed = 0.0
+            for tile_start in range(0, number_of_atoms, _cuda_block_size):
+                a = tile_start + thread
+                if a < number_of_atoms:
+                    shared_positions[thread, 0] = atom_positions[a, 0]
+                    shared_positions[thread, 1] = atom_positions[a, 1]
+                    shared_positions[thread, 2] = atom_positions[a, 2]
+                cuda.syncthreads()
+
+                tile_size = min(_cuda_block_size, number_of_atoms - tile_start)
+                if g < grid_coords.shape[0]:
+                    for t in range(tile_size):
+                        dx = x - shared_positions[t, 0]
+                        dy = y - shared_positions[t, 1]
+                        dz = z - shared_positions[t, 2]
+                        distance_squared = dx * dx + dy * dy + dz * dz
+                        if distance_squared < cutoff_squared:
+                            summed += math.exp(
+                                -distance_squared * argumentfactor
+                            )
+                cuda.syncthreads()
+
+            if g < grid_coords.shape[0]:
+                out[g] = prefactor * summed
+
+        _numba_cuda_gaussian_kernel = kernel
+    return _numba_cuda_gaussian_kernel
+
 
 class AtomicDensity(Descriptor):
     """Class for calculation and parsing of Gaussian descriptors.
@@ -33,6 +425,12 @@ class AtomicDensity(Descriptor):
         super(AtomicDensity, self).__init__(parameters)
         self.verbosity = parameters.verbosity
 
+        # Cached Gaussian normalization factors; they only depend on
+        # sigma and are reused between frames (see _calculate).
+        self._factor_sigma = None
+        self._prefactor = None
+        self._argumentfactor = None
+
     @property
     def data_name(self):
         """Get a string that describes the target (for e.g. metadata)."""
@@ -108,11 +506,74 @@ class AtomicDensity(Descriptor):
         optimal_sigma : float
             The optimal sigma value.
         """
+        # The voxel is characterized by its edge lengths, i.e., the row
+        # norms of the cell matrix. For triclinic cells, np.max over the
+        # raw matrix entries would yield the largest component rather
+        # than the largest edge length.
         return (
-            np.max(voxel) / reference_grid_spacing_aluminium
+            np.max(np.linalg.norm(np.asarray(voxel), axis=1))
+            / reference_grid_spacing_aluminium
         ) * optimal_sigma_aluminium
 
+    @staticmethod
+    def _to_contiguous_blocked(descriptors, block_size=32):
+        """
+        Copy a strided descriptor view into a C-contiguous array.
+
+        A naive copy of the (nx, ny, nz, channels) view on the x-fastest
+        LAMMPS buffer walks the source with large strides and thrashes
+        the cache once the array exceeds the last-level cache. Copying in
+        cubic blocks keeps both source and destination accesses local.
+
+        Parameters
+        ----------
+        descriptors : numpy.array
+            Strided (nx, ny, nz, channels) view on an x-fastest buffer.
+
+        block_size : int
+            Edge length (in grid points) of the blocks used for copying.
+
+        Returns
+        -------
+        contiguous_descriptors : numpy.array
+            C-contiguous copy of the input array.
+        """
+        nx, ny, nz = np.shape(descriptors)[0:3]
+        contiguous_descriptors = np.empty(
+            np.shape(descriptors), dtype=descriptors.dtype
+        )
+        for x in range(0, nx, block_size):
+            for y in range(0, ny, block_size):
+                for z in range(0, nz, block_size):
+                    contiguous_descriptors[
+                        x : x + block_size,
+                        y : y + block_size,
+                        z : z + block_size,
+                    ] = descriptors[
+                        x : x + block_size,
+                        y : y + block_size,
+                        z : z + block_size,
+                    ]
+        return contiguous_descriptors
+
     def _calculate(self, outdir, **kwargs):
+        # Check if we have to determine the optimal sigma value. This is
+        # needed by both the LAMMPS and the python path, so it is done
+        # once here before dispatching.
+        if self.parameters.atomic_density_sigma is None:
+            self.parameters.atomic_density_sigma = self.get_optimal_sigma(
+                self.voxel
+            )
+
+        # The Gaussian normalization factors only depend on sigma, so
+        # they are cached on the instance and reused when calculating
+        # descriptors for many frames of the same system.
+        sigma = self.parameters.atomic_density_sigma
+        if self._factor_sigma != sigma:
+            self._factor_sigma = sigma
+            self._prefactor = 1.0 / (np.power(sigma * np.sqrt(2 * np.pi), 3))
+            self._argumentfactor = 1.0 / (2.0 * sigma * sigma)
+
         if self.parameters._configuration["lammps"]:
             if find_spec("lammps") is None:
                 printout(
@@ -137,7 +598,7 @@ class AtomicDensity(Descriptor):
         keep_logs = kwargs.get("keep_logs", False)
 
         lammps_format = "lammps-data"
-        self.setup_lammps_tmp_files("ggrid", outdir)
+        self.setup_lammps_tmp_files("ggrid", outdir, keep_logs=keep_logs)
 
         ase.io.write(
             self.lammps_temporary_input, self.atoms, format=lammps_format
@@ -147,13 +608,6 @@ class AtomicDensity(Descriptor):
         ny = self.grid_dimensions[1]
         nz = self.grid_dimensions[2]
 
-        # Check if we have to determine the optimal sigma value.
-        if self.parameters.atomic_density_sigma is None:
-            self.grid_dimensions = [nx, ny, nz]
-            self.parameters.atomic_density_sigma = self.get_optimal_sigma(
-                self.voxel
-            )
-
         # Create LAMMPS instance.
         lammps_dict = {
             "sigma": self.parameters.atomic_density_sigma,
@@ -181,28 +635,16 @@ class AtomicDensity(Descriptor):
         # Do the LAMMPS calculation and clean up.
         lmp.file(self.parameters.lammps_compute_file)
 
-        # Extract the data.
-        nrows_ggrid = extract_compute_np(
-            lmp,
-            "ggrid",
-            lammps_constants.LMP_STYLE_LOCAL,
-            lammps_constants.LMP_SIZE_ROWS,
-        )
-        ncols_ggrid = extract_compute_np(
-            lmp,
-            "ggrid",
-            lammps_constants.LMP_STYLE_LOCAL,
-            lammps_constants.LMP_SIZE_COLS,
-        )
-
+        # Extract the data. The array shape is queried within the helper
+        # call, so only one call is needed here instead of three.
         gaussian_descriptors_np = extract_compute_np(
             lmp,
             "ggrid",
             lammps_constants.LMP_STYLE_LOCAL,
             2,
-            array_shape=(nrows_ggrid, ncols_ggrid),
             use_fp64=use_fp64,
         )
+        nrows_ggrid = np.shape(gaussian_descriptors_np)[0]
         self._clean_calculation(lmp, keep_logs)
 
         # In comparison to SNAP, the atomic density always returns
@@ -226,6 +668,10 @@ class AtomicDensity(Descriptor):
                 # Here, we want to do something else with the atomic density,
                 # and thus have to properly reorder it.
                 # We have to switch from x fastest to z fastest reordering.
+                # Note that reshape on the contiguous LAMMPS buffer and
+                # the subsequent transpose are both zero-copy: the result
+                # is a strided view presenting (nx, ny, nz, 7) indexing
+                # while the underlying memory keeps its x-fastest order.
                 gaussian_descriptors_np = gaussian_descriptors_np.reshape(
                     (
                         self.grid_dimensions[2],
@@ -237,6 +683,13 @@ class AtomicDensity(Descriptor):
                 gaussian_descriptors_np = gaussian_descriptors_np.transpose(
                     [2, 1, 0, 3]
                 )
+                # Downstream consumers (saving, QE) expect a C-contiguous
+                # array, so the view is copied once here - in cache-sized
+                # blocks, since a naive copy of the transposed view
+                # strides through the source.
+                gaussian_descriptors_np = self._to_contiguous_blocked(
+                    gaussian_descriptors_np
+                )
                 if self.parameters.descriptors_contain_xyz:
                     self.fingerprint_length = 4
                     return gaussian_descriptors_np[:, :, :, 3:], nx * ny * nz
@@ -259,7 +712,8 @@ class AtomicDensity(Descriptor):
             - It is roughly an order of magnitude slower for small systems
               and doesn't scale too great
             - It only works for ONE chemical element
-            - It has no MPI or GPU support
+            - It has no MPI support; GPU support requires numba with a
+              CUDA-capable device
         """
         printout(
             "Using python for descriptor calculation. "
@@ -267,66 +721,172 @@ class AtomicDensity(Descriptor):
             "large systems."
         )
 
-        gaussian_descriptors_np = np.zeros(
-            (
-                self.grid_dimensions[0],
-                self.grid_dimensions[1],
-                self.grid_dimensions[2],
-                4,
-            ),
-            dtype=np.float64,
+        # As in the LAMMPS path, single precision is the default working
+        # precision; double precision can be enforced via the use_fp64
+        # keyword. Atomic density values are ML features, so the reduced
+        # accumulation accuracy is negligible, while memory usage and
+        # bandwidth are halved.
+        use_fp64 = kwargs.get("use_fp64", False)
+        dtype = np.float64 if use_fp64 else DEFAULT_NP_DATA_DTYPE
+
+        # If numba is used, exp(-x) may optionally be replaced by a
+        # polynomial approximation (absolute accuracy around 1e-5, which
+        # is plenty for ML features, but not for production data).
+        use_fast_exp = kwargs.get("use_fast_exp", False)
+
+        # For large grids the output array can reach several GB. If an
+        # out_path is given, it is allocated as a file-backed memory map
+        # instead, so the result is streamed to disk by the kernel and
+        # never has to fit into memory at once (and can be handed to the
+        # caller without a further copy).
+        out_path = kwargs.get("out_path", None)
+        output_shape = (
+            self.grid_dimensions[0],
+            self.grid_dimensions[1],
+            self.grid_dimensions[2],
+            4,
         )
-
-        # Construct the hyperparameters to calculate the Gaussians.
-        # This follows the implementation in the LAMMPS code.
-        if self.parameters.atomic_density_sigma is None:
-            self.parameters.atomic_density_sigma = self.get_optimal_sigma(
-                self.voxel
+        if out_path is not None:
+            gaussian_descriptors_np = np.memmap(
+                out_path, dtype=dtype, mode="w+", shape=output_shape
             )
+            gaussian_descriptors_np[:] = 0
+        else:
+            gaussian_descriptors_np = np.zeros(output_shape, dtype=dtype)
+
+        # The hyperparameters of the Gaussians follow the implementation
+        # in the LAMMPS code; they are computed (and cached) in
+        # _calculate, since they are shared with the LAMMPS path.
+        prefactor = self._prefactor
+        argumentfactor = self._argumentfactor
+
+        # Create a list of all potentially relevant atoms.
+        all_atoms = self._setup_atom_list().astype(dtype, copy=False)
+
+        nx = self.grid_dimensions[0]
+        ny = self.grid_dimensions[1]
+        nz = self.grid_dimensions[2]
+
+        # Compute the coordinates of all grid points in one vectorized
+        # sweep, by mapping the fractional grid through the cell matrix
+        # (see domain.cpp). For orthorhombic cells the cell matrix is
+        # diagonal, so no separate branch is needed; the general
+        # fractional-to-Cartesian map covers both cases uniformly and,
+        # expressed as one (Ngrid, 3) x (3, 3) matrix multiplication,
+        # runs as a single BLAS call.
+        fractional_grid = np.stack(
+            np.meshgrid(
+                np.arange(nx) / nx,
+                np.arange(ny) / ny,
+                np.arange(nz) / nz,
+                indexing="ij",
+            ),
+            axis=-1,
+        ).reshape(-1, 3)
+        gaussian_descriptors_np[:, :, :, 0:3] = (
+            fractional_grid @ np.asarray(self.atoms.cell)
+        ).reshape(nx, ny, nz, 3)
+
+        grid_coords = gaussian_descriptors_np[:, :, :, 0:3].reshape(-1, 3)
         cutoff_squared = (
             self.parameters.atomic_density_cutoff
             * self.parameters.atomic_density_cutoff
         )
-        prefactor = 1.0 / (
-            np.power(
-                self.parameters.atomic_density_sigma * np.sqrt(2 * np.pi), 3
-            )
-        )
-        argumentfactor = 1.0 / (
-            2.0
-            * self.parameters.atomic_density_sigma
-            * self.parameters.atomic_density_sigma
-        )
-
-        # Create a list of all potentially relevant atoms.
-        all_atoms = self._setup_atom_list()
-
-        # I think this nested for-loop could probably be optimized if instead
-        # the density matrix is used on the entire grid. That would be VERY
-        # memory-intensive. Since the goal of such an optimization would be
-        # to use this implementation at potentially larger length-scales,
-        # one would have to investigate that this is OK memory-wise.
-        # I haven't optimized it yet for the smaller scales since there
-        # the performance was already good enough.
-        for i in range(0, self.grid_dimensions[0]):
-            for j in range(0, self.grid_dimensions[1]):
-                for k in range(0, self.grid_dimensions[2]):
-                    # Compute the grid.
-                    gaussian_descriptors_np[i, j, k, 0:3] = (
-                        self._grid_to_coord([i, j, k])
+        if find_spec("numba") is not None:
+            # If numba is available, the element-wise kernel is the
+            # fastest option: the cutoff test, exp and reduction fuse in
+            # registers, without ever materializing a distance matrix.
+            # On GPU one thread is launched per grid point, on CPU the
+            # grid loop is multi-threaded.
+            gaussians = None
+            if self.parameters._configuration["gpu"]:
+                from numba import cuda
+
+                if cuda.is_available():
+                    kernel = _get_numba_cuda_gaussian_kernel()
+                    grid_coords_device = cuda.to_device(grid_coords)
+                    positions_device = cuda.to_device(
+                        np.ascontiguousarray(all_atoms)
                     )
-
-                    # Compute the Gaussian descriptors.
-                    dm = np.squeeze(
-                        distance.cdist(
-                            [gaussian_descriptors_np[i, j, k, 0:3]], all_atoms
-                        )
+                    gaussians_device = cuda.device_array(
+                        grid_coords.shape[0], dtype=dtype
                     )
-                    dm = dm * dm
-                    dm_cutoff = dm[np.argwhere(dm < cutoff_squared)]
-                    gaussian_descriptors_np[i, j, k, 3] += np.sum(
-                        prefactor * np.exp(-dm_cutoff * argumentfactor)
+                    blocks = (
+                        grid_coords.shape[0] + _cuda_block_size - 1
+                    ) // _cuda_block_size
+                    kernel[blocks, _cuda_block_size](
+                        grid_coords_device,
+                        positions_device,
+                        cutoff_squared,
+                        prefactor,
+                        argumentfactor,
+                        gaussians_device,
+                    )
+                    gaussians = gaussians_device.copy_to_host()
+                else:
+                    printout(
+                        "GPU requested for descriptor calculation, but "
+                        "no CUDA device found by numba, falling back "
+                        "to CPU."
                     )
+            if gaussians is None:
+                # On the CPU, atoms are additionally sorted into
+                # cell-linked bins of the cutoff size, so each grid point
+                # only visits atoms from its 27 surrounding bins instead
+                # of the whole atom list.
+                gaussians = np.zeros(grid_coords.shape[0], dtype=dtype)
+                cutoff = self.parameters.atomic_density_cutoff
+                (
+                    sorted_positions,
+                    bin_starts,
+                    bin_dimensions,
+                    origin,
+                ) = _bin_atoms(all_atoms, cutoff)
+                # The kernel is specialized (and cached) per
+                # (sigma, cutoff) pair, with all derived factors baked
+                # in as compile-time constants.
+                kernel = _get_numba_gaussian_kernel(
+                    self.parameters.atomic_density_sigma,
+                    cutoff,
+                    use_fast_exp,
+                )
+                kernel(
+                    grid_coords,
+                    sorted_positions,
+                    bin_starts,
+                    bin_dimensions,
+                    origin,
+                    gaussians,
+                )
+            gaussian_descriptors_np[:, :, :, 3] = gaussians.reshape(nx, ny, nz)
+        else:
+            # Without numba, the grid is processed with vectorized NumPy
+            # operations, optionally split into slabs distributed over
+            # worker processes (each slab writes a disjoint part of the
+            # output, so assembly is a simple concatenation).
+            slab_function = partial(
+                _compute_gaussian_slab,
+                all_atoms=all_atoms,
+                cutoff=self.parameters.atomic_density_cutoff,
+                prefactor=prefactor,
+                argumentfactor=argumentfactor,
+            )
+            n_workers = kwargs.get("n_workers", 1)
+            if n_workers > 1:
+                with concurrent.futures.ProcessPoolExecutor(
+                    max_workers=n_workers
+                ) as executor:
+                    gaussians = np.concatenate(
+                        list(
+                            executor.map(
+                                slab_function,
+                                np.array_split(grid_coords, n_workers),
+                            )
+                        )
+                    )
+            else:
+                gaussians = slab_function(grid_coords)
+            gaussian_descriptors_np[:, :, :, 3] = gaussians.reshape(nx, ny, nz)
 
         if self.parameters.descriptors_contain_xyz:
             self.fingerprint_length = 4
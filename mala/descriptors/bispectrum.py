@@ -142,7 +142,7 @@ class Bispectrum(Descriptor):
         keep_logs = kwargs.get("keep_logs", False)
 
         lammps_format = "lammps-data"
-        self.setup_lammps_tmp_files("bgrid", outdir)
+        self.setup_lammps_tmp_files("bgrid", outdir, keep_logs=keep_logs)
 
         ase.io.write(
             self.lammps_temporary_input, self.atoms, format=lammps_format
@@ -218,7 +218,7 @@ class Descriptor(PhysicalData):
             "this descriptor type."
         )
 
-    def setup_lammps_tmp_files(self, lammps_type, outdir):
+    def setup_lammps_tmp_files(self, lammps_type, outdir, keep_logs=False):
         """
         Create the temporary lammps input and log files.
 
@@ -228,7 +228,10 @@ class Descriptor(PhysicalData):
             Type of descriptor calculation (e.g. bgrid for bispectrum)
         outdir: str
             Directory where lammps files are kept
-        
+        keep_logs: bool
+            If True, the files are kept after the calculation, so both
+            are placed in outdir, where users expect to find them.
+
         Returns
         -------
         None
@@ -236,8 +239,20 @@ class Descriptor(PhysicalData):
         if get_rank() == 0:
             prefix_inp_str = "lammps_" + lammps_type + "_input"
             prefix_log_str = "lammps_" + lammps_type + "_log"
-            lammps_tmp_input_file=tempfile.NamedTemporaryFile(
-                delete=False, prefix=prefix_inp_str, suffix="_.tmp", dir=outdir
+            # The input file is written once and immediately read back by
+            # LAMMPS, so it is placed on tmpfs (shared memory) where
+            # available, avoiding the round-trip through the filesystem -
+            # unless it is to be kept, in which case it belongs in
+            # outdir like the log file.
+            if keep_logs or not os.path.isdir("/dev/shm"):
+                input_dir = outdir
+            else:
+                input_dir = "/dev/shm"
+            lammps_tmp_input_file = tempfile.NamedTemporaryFile(
+                delete=False,
+                prefix=prefix_inp_str,
+                suffix="_.tmp",
+                dir=input_dir,
             )
             self.lammps_temporary_input = lammps_tmp_input_file.name
             lammps_tmp_input_file.close()
@@ -766,7 +781,7 @@ class Descriptor(PhysicalData):
 
                     # prepare z plane cuts for balance command in lammps
                     if int(nz / zprocs) == (nz / zprocs):
-                        printout("No remainder in z")
+                        printout("No remainder in z", min_verbosity=2)
                         zcut = 1 / nz
                         zint = ""
                         for i in range(0, zprocs - 1):
@@ -878,22 +893,27 @@ class Descriptor(PhysicalData):
             )
             all_cells_list = None
 
-            # For each edge point create a neighborhoodlist to all cells
-            # given by the cutoff radius.
+            # For all edge points, the same template object (the atoms
+            # plus one ghost atom representing the grid point) and a
+            # single neighbor list are reused; only the ghost atom is
+            # moved in place between edge points. This avoids a deep copy
+            # of the atoms object and a neighbor list construction per
+            # edge point.
+            atoms_with_grid_point = self.atoms.copy()
+            atoms_with_grid_point.append(ase.Atom("H", [0, 0, 0]))
+            neighborlist = NeighborList(
+                np.zeros(len(self.atoms) + 1)
+                + [self.parameters.atomic_density_cutoff],
+                bothways=True,
+                self_interaction=False,
+                primitive=NewPrimitiveNeighborList,
+            )
+
+            # For each edge point update the neighbor list to find all
+            # cells given by the cutoff radius.
             for edge in edges:
                 edge_point = self._grid_to_coord(edge)
-                neighborlist = NeighborList(
-                    np.zeros(len(self.atoms) + 1)
-                    + [self.parameters.atomic_density_cutoff],
-                    bothways=True,
-                    self_interaction=False,
-                    primitive=NewPrimitiveNeighborList,
-                )
-
-                atoms_with_grid_point = self.atoms.copy()
-
-                # Construct a ghost atom representing the grid point.
-                atoms_with_grid_point.append(ase.Atom("H", edge_point))
+                atoms_with_grid_point.positions[-1] = edge_point
                 neighborlist.update(atoms_with_grid_point)
                 indices, offsets = neighborlist.get_neighbors(len(self.atoms))
 
@@ -992,27 +1012,13 @@ class Descriptor(PhysicalData):
 
     def _grid_to_coord(self, gridpoint):
         # Convert grid indices to real space grid point.
-        i = gridpoint[0]
-        j = gridpoint[1]
-        k = gridpoint[2]
-        # Orthorhombic cells and triclinic ones have
-        # to be treated differently, see domain.cpp
-
-        if self.atoms.cell.orthorhombic:
-            return np.diag(self.voxel) * [i, j, k]
-        else:
-            ret = [0, 0, 0]
-            ret[0] = (
-                i / self.grid_dimensions[0] * self.atoms.cell[0, 0]
-                + j / self.grid_dimensions[1] * self.atoms.cell[1, 0]
-                + k / self.grid_dimensions[2] * self.atoms.cell[2, 0]
-            )
-            ret[1] = (
-                j / self.grid_dimensions[1] * self.atoms.cell[1, 1]
-                + k / self.grid_dimensions[2] * self.atoms.cell[1, 2]
-            )
-            ret[2] = k / self.grid_dimensions[2] * self.atoms.cell[2, 2]
-            return np.array(ret)
+        # The fractional-to-Cartesian map frac @ cell covers orthorhombic
+        # and triclinic cells alike (see domain.cpp); for orthorhombic
+        # cells the cell matrix is diagonal and the map reduces to a
+        # per-axis scaling with the voxel lengths.
+        return (
+            np.asarray(gridpoint) / np.asarray(self.grid_dimensions)
+        ) @ np.asarray(self.atoms.cell)
 
     @abstractmethod
     def _calculate(self, outdir, **kwargs):
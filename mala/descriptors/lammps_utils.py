@@ -59,7 +59,9 @@ def extract_compute_np(
         Result type of the LAMMPS calculation.
 
     array_shape
-        Array shape of the LAMMPS calculation.
+        Array shape of the LAMMPS calculation. If None and result_type
+        equals 2, the shape is queried from LAMMPS here, saving the
+        caller two separate size queries.
 
     use_fp64 : bool
         If True, return the array with double precision. If False (default),
@@ -71,6 +73,20 @@ def extract_compute_np(
     if result_type == 0:
         return ptr  # No casting needed, lammps.py already works
     if result_type == 2:
+        if array_shape is None:
+            # For version compatibility; older lammps versions (the
+            # serial version we still use on some machines) have these
+            # constants as part of the general LAMMPS import.
+            from lammps import constants as lammps_constants
+
+            array_shape = (
+                lmp.extract_compute(
+                    name, compute_type, lammps_constants.LMP_SIZE_ROWS
+                ),
+                lmp.extract_compute(
+                    name, compute_type, lammps_constants.LMP_SIZE_COLS
+                ),
+            )
         ptr = ptr.contents
         total_size = np.prod(array_shape)
         buffer_ptr = ctypes.cast(
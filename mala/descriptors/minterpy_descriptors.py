@@ -163,7 +163,9 @@ class MinterpyDescriptors(Descriptor):
 
             # The rest is the stanfard LAMMPS atomic density stuff.
             lammps_format = "lammps-data"
-            self.setup_lammps_tmp_files("minterpy", outdir)
+            self.setup_lammps_tmp_files(
+                "minterpy", outdir, keep_logs=keep_logs
+            )
 
             ase.io.write(
                 self.lammps_temporary_input, self.atoms, format=lammps_format
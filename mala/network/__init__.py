@@ -1,6 +1,6 @@
 """Everything concerning network and network architecture."""
 
-from .network import Network
+from .network import Network, build_network
 from .tester import Tester
 from .trainer import Trainer
 from .hyper_opt import HyperOpt
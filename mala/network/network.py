@@ -1,7 +1,8 @@
 """Neural network for MALA."""
 
 from abc import abstractmethod
-import numpy as np
+import math
+
 import torch
 import torch.distributed as dist
 import torch.nn as nn
@@ -10,6 +11,26 @@ import torch.nn.functional as functional
 from mala.common.parameters import Parameters
 from mala.common.parallelizer import printout
 
+# Mappings for parsing of the activation layers, shared by all network
+# classes.
+_activation_mappings = {
+    "Sigmoid": nn.Sigmoid,
+    "ReLU": nn.ReLU,
+    "LeakyReLU": nn.LeakyReLU,
+    "Tanh": nn.Tanh,
+}
+
+# In-place variants of the activations that support them. Only used in
+# the feed-forward layer stacks, where each activation directly follows
+# a linear layer whose pre-activation output is not reused; in the
+# recurrent networks the activation is also applied to a view of the
+# recurrent layer's output, where an in-place write would corrupt the
+# backward pass.
+_inplace_activation_mappings = {
+    "ReLU": lambda: nn.ReLU(inplace=True),
+    "LeakyReLU": lambda: nn.LeakyReLU(inplace=True),
+}
+
 
 class Network(nn.Module):
     """
@@ -31,32 +52,23 @@ class Network(nn.Module):
 
         The correct type of neural network will automatically be instantiated
         by this class if possible. You can also instantiate the desired
-        network directly by calling upon the subclass.
+        network directly by calling upon the subclass. New code should
+        prefer the build_network factory function, which dispatches
+        without this __new__ machinery.
 
         Parameters
         ----------
         params : mala.common.parametes.Parameters
             Parameters used to create this neural network.
         """
-        model = None
-
         # Check if we're accessing through base class.
         # If not, we need to return the correct object directly.
         if cls == Network:
-            if params.network.nn_type == "feed-forward":
-                model = super(Network, FeedForwardNet).__new__(FeedForwardNet)
-
-            elif params.network.nn_type == "transformer":
-                model = super(Network, TransformerNet).__new__(TransformerNet)
-
-            elif params.network.nn_type == "lstm":
-                model = super(Network, LSTM).__new__(LSTM)
-
-            elif params.network.nn_type == "gru":
-                model = super(Network, GRU).__new__(GRU)
-
-            if model is None:
+            try:
+                subclass = _network_types[params.network.nn_type]
+            except KeyError:
                 raise Exception("Unsupported network architecture.")
+            model = super(Network, subclass).__new__(subclass)
         else:
             model = super(Network, cls).__new__(cls)
 
@@ -77,14 +89,6 @@ class Network(nn.Module):
         # initialize the parent class
         super(Network, self).__init__()
 
-        # Mappings for parsing of the activation layers.
-        self.activation_mappings = {
-            "Sigmoid": nn.Sigmoid,
-            "ReLU": nn.ReLU,
-            "LeakyReLU": nn.LeakyReLU,
-            "Tanh": nn.Tanh,
-        }
-
         # initialize the layers
         self.number_of_layers = len(self.params.layer_sizes) - 1
 
@@ -94,11 +98,56 @@ class Network(nn.Module):
         else:
             raise Exception("Unsupported loss function.")
 
+        # Mixed precision: on GPU, the forward passes may optionally run
+        # under autocast in a 16 bit format (see ParametersNetwork).
+        # There are no convolutions in any of the architectures, so no
+        # channels-last memory format is needed for tensor core usage.
+        if self.params.precision == "fp32":
+            self._use_autocast = False
+            self._autocast_dtype = torch.float32
+        elif self.params.precision == "bf16":
+            self._use_autocast = params.use_gpu
+            self._autocast_dtype = torch.bfloat16
+        elif self.params.precision == "fp16":
+            self._use_autocast = params.use_gpu
+            self._autocast_dtype = torch.float16
+        else:
+            raise Exception("Unsupported precision.")
+
+        # Captured CUDA graphs for inference, keyed by input shape (see
+        # do_prediction).
+        self._cuda_graph_cache = {}
+
+        # Optionally compile the forward pass with torch.compile.
+        # Compilation is lazy, i.e., triggered by the first forward
+        # call, so binding here - before the subclasses have built their
+        # layers - is fine.
+        if self.params.use_compile:
+            self.forward = torch.compile(self.forward, mode="reduce-overhead")
+
     @abstractmethod
     def forward(self, inputs):
         """Abstract method. To be implemented by the derived class."""
         pass
 
+    def _move_to_device(self):
+        """
+        Move the network to the configured device in one batched pass.
+
+        Called by the subclasses at the end of their __init__. For GPU
+        targets, host-resident parameters and buffers are pinned first,
+        so the copies can be issued asynchronously back-to-back on one
+        stream instead of synchronizing once per parameter.
+        """
+        device = self.params._configuration["device"]
+        if "cuda" in str(device):
+            for tensor in list(self.parameters()) + list(self.buffers()):
+                if tensor.data.device.type == "cpu":
+                    tensor.data = tensor.data.pin_memory()
+            self.to(device, non_blocking=True)
+        else:
+            self.to(device)
+
     def do_prediction(self, array):
         """
         Predict the output values for an input array..
@@ -120,9 +169,53 @@ class Network(nn.Module):
 
         """
         self.eval()
+        if self.params.use_cuda_graphs and array.is_cuda:
+            return self.__do_prediction_cuda_graph(array)
         with torch.no_grad():
             return self(array)
 
+    def __do_prediction_cuda_graph(self, array):
+        """
+        Predict through a captured CUDA graph, cached per input shape.
+
+        Replaying a captured graph replaces the per-kernel launch
+        overhead of the forward pass with a single launch, which pays
+        off for small networks evaluated repeatedly with a fixed input
+        shape. The first call per shape captures the graph (including a
+        few warmup iterations); subsequent calls only copy the input
+        into the static buffer and replay.
+
+        Parameters
+        ----------
+        array : torch.Tensor
+            Input array for which the prediction is to be performed.
+            Must reside on the GPU.
+
+        Returns
+        -------
+        predicted_array : torch.Tensor
+            Predicted outputs of array.
+        """
+        cached = self._cuda_graph_cache.get(array.shape)
+        if cached is None:
+            static_input = array.clone()
+            # Warm up on a side stream, as required before capture.
+            side_stream = torch.cuda.Stream()
+            side_stream.wait_stream(torch.cuda.current_stream())
+            with torch.cuda.stream(side_stream), torch.no_grad():
+                for _ in range(3):
+                    static_output = self(static_input)
+            torch.cuda.current_stream().wait_stream(side_stream)
+            graph = torch.cuda.CUDAGraph()
+            with torch.cuda.graph(graph), torch.no_grad():
+                static_output = self(static_input)
+            cached = (graph, static_input, static_output)
+            self._cuda_graph_cache[array.shape] = cached
+        graph, static_input, static_output = cached
+        static_input.copy_(array)
+        graph.replay()
+        return static_output.clone()
+
     def calculate_loss(self, output, target):
         """
         Calculate the loss for a predicted output and target.
@@ -143,8 +236,6 @@ class Network(nn.Module):
         """
         return self.loss_func(output, target)
 
-    # FIXME: This guarentees downwards compatibility, but it is ugly.
-    #  Rather enforce the right package versions in the repo.
     def save_network(self, path_to_file):
         """
         Save the network.
@@ -161,11 +252,10 @@ class Network(nn.Module):
         if self.use_ddp:
             if dist.get_rank() != 0:
                 return
-        torch.save(
-            self.state_dict(),
-            path_to_file,
-            _use_new_zipfile_serialization=False,
-        )
+        # The default zip serialization supports random access and
+        # memory-mapped loading (see load_from_file); the legacy format
+        # was only kept for compatibility with very old torch versions.
+        torch.save(self.state_dict(), path_to_file)
 
     @classmethod
     def load_from_file(cls, params, file):
@@ -188,10 +278,29 @@ class Network(nn.Module):
         loaded_network : Network
             The network that was loaded from the file.
         """
-        loaded_network = Network(params)
-        loaded_network.load_state_dict(
-            torch.load(file, map_location=params.device)
-        )
+        loaded_network = build_network(params)
+        if isinstance(file, str):
+            # Memory-map the checkpoint instead of reading it into RAM
+            # in one piece; tensors are paged in on first access, so the
+            # peak memory during loading is no longer twice the network
+            # size.
+            try:
+                state_dict = torch.load(file, map_location="cpu", mmap=True)
+            except (RuntimeError, TypeError):
+                # Checkpoints in the legacy (non-zip) serialization
+                # format and older torch versions do not support mmap.
+                state_dict = torch.load(file, map_location="cpu")
+        else:
+            # File-like objects (e.g. ZipExtFile members of .zip
+            # archives) cannot be memory-mapped.
+            state_dict = torch.load(file, map_location="cpu")
+        # Checkpoints written before the positional encoding buffer
+        # became non-persistent still carry it. It is fully rebuilt in
+        # __init__, so it can simply be dropped instead of tripping the
+        # strict unexpected-key check.
+        state_dict.pop("pos_encoder.pe", None)
+        loaded_network.load_state_dict(state_dict)
+        loaded_network.to(params.device)
         loaded_network.eval()
         return loaded_network
 
@@ -202,7 +311,7 @@ class FeedForwardNet(Network):
     def __init__(self, params):
         super(FeedForwardNet, self).__init__(params)
 
-        self.layers = nn.ModuleList()
+        layers = []
 
         # If we have only one entry in the activation list,
         # we use it for the entire list.
@@ -225,35 +334,82 @@ class FeedForwardNet(Network):
 
         # Add the layers.
         # As this is a feedforward layer we always add linear layers, and then
-        # an activation function
-        for i in range(0, self.number_of_layers):
-            self.layers.append(
-                (
-                    nn.Linear(
+        # an activation function - either as two separate modules, as
+        # one fused module combining both operations, or, for runs of
+        # equal-width layers, as one block with stacked weights.
+        i = 0
+        while i < self.number_of_layers:
+            if use_only_one_activation_type:
+                activation_name = self.params.layer_activations[0]
+            else:
+                activation_name = self.params.layer_activations[i]
+            if self.params.use_batched_layers:
+                width = self.params.layer_sizes[i]
+                run_length = 0
+                while (
+                    i + run_length < self.number_of_layers
+                    and self.params.layer_sizes[i + run_length] == width
+                    and self.params.layer_sizes[i + run_length + 1] == width
+                    and (
+                        use_only_one_activation_type
+                        or self.params.layer_activations[i + run_length]
+                        == activation_name
+                    )
+                ):
+                    run_length += 1
+                if run_length > 1:
+                    layers.append(
+                        BatchedLinearBlock(run_length, width, activation_name)
+                    )
+                    i += run_length
+                    continue
+            if self.params.use_fused_layers:
+                layers.append(
+                    FusedLinearAct(
                         self.params.layer_sizes[i],
                         self.params.layer_sizes[i + 1],
+                        activation_name,
                     )
                 )
-            )
-            try:
-                if use_only_one_activation_type:
-                    self.layers.append(
-                        self.activation_mappings[
-                            self.params.layer_activations[0]
-                        ]()
-                    )
-                else:
-                    self.layers.append(
-                        self.activation_mappings[
-                            self.params.layer_activations[i]
-                        ]()
+            else:
+                layers.append(
+                    (
+                        nn.Linear(
+                            self.params.layer_sizes[i],
+                            self.params.layer_sizes[i + 1],
+                        )
                     )
-            except KeyError:
-                raise Exception("Invalid activation type seleceted.")
+                )
+                try:
+                    if (
+                        self.params.inplace_activations
+                        and activation_name in _inplace_activation_mappings
+                    ):
+                        layers.append(
+                            _inplace_activation_mappings[activation_name]()
+                        )
+                    else:
+                        layers.append(_activation_mappings[activation_name]())
+                except KeyError:
+                    raise Exception("Invalid activation type seleceted.")
+            i += 1
+
+        # nn.Sequential runs the layer chain without a Python frame per
+        # module call and keeps the same per-index parameter naming as
+        # the previously used ModuleList, so saved networks stay
+        # compatible.
+        self.layers = nn.Sequential(*layers)
 
         # Once everything is done, we can move the Network on the target
         # device.
-        self.to(self.params._configuration["device"])
+        self._move_to_device()
+
+        # Optionally compile the layer stack with TorchScript, which
+        # executes the entire Linear/activation chain as one graph call
+        # and lets the JIT fusers merge the activations into the matrix
+        # multiplications.
+        if self.params.use_jit:
+            self.layers = torch.jit.script(self.layers)
 
     def forward(self, inputs):
         """
@@ -269,10 +425,134 @@ class FeedForwardNet(Network):
         predicted_array : torch.Tensor
             Predicted outputs of array.
         """
-        # Forward propagate data.
-        for layer in self.layers:
-            inputs = layer(inputs)
-        return inputs
+        # Forward propagate data. The autocast context is only entered
+        # when mixed precision is actually enabled, keeping the default
+        # fp32 path free of per-call context overhead.
+        if self._use_autocast:
+            with torch.autocast(
+                device_type="cuda", dtype=self._autocast_dtype
+            ):
+                return self.layers(inputs)
+        return self.layers(inputs)
+
+
+class FusedLinearAct(nn.Module):
+    """
+    One fused linear/activation block of a feed-forward network.
+
+    Combining both operations in a single module halves the number of
+    module dispatches per layer and presents the activation in the same
+    forward graph as the matrix multiplication, so that TorchScript and
+    torch.compile can fuse it into the GEMM epilogue instead of
+    materializing the intermediate tensor.
+
+    Parameters
+    ----------
+    in_features : int
+        Input dimension of the linear layer.
+
+    out_features : int
+        Output dimension of the linear layer.
+
+    activation_name : string
+        Name of the activation function, using the same names as
+        ParametersNetwork.layer_activations.
+    """
+
+    def __init__(self, in_features, out_features, activation_name):
+        super(FusedLinearAct, self).__init__()
+        self.linear = nn.Linear(in_features, out_features)
+        # The activation is held as a submodule (rather than a bare
+        # function reference), so the block stays scriptable with
+        # torch.jit; activation modules carry no parameters, so the
+        # state dict layout is unaffected.
+        try:
+            self.activation = _activation_mappings[activation_name]()
+        except KeyError:
+            raise Exception("Invalid activation type seleceted.")
+
+    def forward(self, x):
+        """
+        Perform a forward pass through this block.
+
+        Parameters
+        ----------
+        x : torch.Tensor
+            Input array for which the forward pass is to be performed.
+
+        Returns
+        -------
+        predicted_array : torch.Tensor
+            Activated output of the linear layer.
+        """
+        return self.activation(self.linear(x))
+
+
+class BatchedLinearBlock(nn.Module):
+    """
+    A run of equal-width linear/activation layers with stacked weights.
+
+    The weights of all layers in the run are stored as one
+    (depth, width, width) parameter (and the biases as (depth, width)),
+    so compilers see the run as a batched matrix multiplication
+    sequence and can amortize dispatch and tiling overhead across the
+    layers instead of launching each one individually.
+
+    Parameters
+    ----------
+    depth : int
+        Number of layers in the run.
+
+    width : int
+        Input and output dimension of every layer in the run.
+
+    activation_name : string
+        Name of the activation function applied after each layer, using
+        the same names as ParametersNetwork.layer_activations.
+    """
+
+    def __init__(self, depth, width, activation_name):
+        super(BatchedLinearBlock, self).__init__()
+        self.depth = depth
+
+        # Each slice is initialized exactly as nn.Linear initializes its
+        # weight and bias.
+        weight = torch.empty(depth, width, width)
+        bias = torch.empty(depth, width)
+        for layer in range(depth):
+            nn.init.kaiming_uniform_(weight[layer], a=math.sqrt(5))
+        bound = 1.0 / math.sqrt(width)
+        nn.init.uniform_(bias, -bound, bound)
+        self.weight = nn.Parameter(weight)
+        self.bias = nn.Parameter(bias)
+
+        # As in FusedLinearAct, a submodule keeps the block scriptable.
+        try:
+            self.activation = _activation_mappings[activation_name]()
+        except KeyError:
+            raise Exception("Invalid activation type seleceted.")
+
+    def forward(self, x):
+        """
+        Perform a forward pass through this block.
+
+        Parameters
+        ----------
+        x : torch.Tensor
+            Input array for which the forward pass is to be performed.
+
+        Returns
+        -------
+        predicted_array : torch.Tensor
+            Output of the last layer of the run.
+        """
+        # A plain python loop over the stacked slices; under
+        # torch.compile the iterations collapse into batched GEMMs.
+        for layer in range(self.depth):
+            x = self.activation(
+                functional.linear(x, self.weight[layer], self.bias[layer])
+            )
+        return x
 
 
 class LSTM(Network):
@@ -287,6 +567,17 @@ class LSTM(Network):
         # check for size for validate and train
         self.hidden = self.init_hidden()
 
+        # Precomputed zero states, assigned by reference in forward when
+        # no_hidden_state is set, instead of zero-filling the state
+        # tensors every step. Non-persistent, so they are not written
+        # into checkpoints.
+        self.register_buffer(
+            "_zero_h", torch.zeros_like(self.hidden[0]), persistent=False
+        )
+        self.register_buffer(
+            "_zero_c", torch.zeros_like(self.hidden[1]), persistent=False
+        )
+
         print("initialising LSTM network")
 
         # First Layer
@@ -312,14 +603,22 @@ class LSTM(Network):
                 self.params.num_hidden_layers,
                 batch_first=True,
             )
-        self.activation = self.activation_mappings[
+        self.activation = _activation_mappings[
             self.params.layer_activations[0]
         ]()
 
         self.batch_size = None
+
+        # Hyperparameters read on every forward pass, cached as plain
+        # python values to avoid the attribute chain through the
+        # parameters object per step.
+        self._no_hidden_state = bool(self.params.no_hidden_state)
+        self._num_hidden_layers = int(self.params.num_hidden_layers)
+        self._lstm_input_size = int(self.params.layer_sizes[1])
+
         # Once everything is done, we can move the Network on the target
         # device.
-        self.to(self.params._configuration["device"])
+        self._move_to_device()
 
     # Apply Network
     def forward(self, x):
@@ -338,33 +637,31 @@ class LSTM(Network):
         """
         self.batch_size = x.shape[0]
 
-        if self.params.no_hidden_state:
-            self.hidden = (
-                self.hidden[0].fill_(0.0),
-                self.hidden[1].fill_(0.0),
-            )
+        if self._no_hidden_state:
+            self.hidden = (self._zero_h, self._zero_c)
 
         self.hidden = (self.hidden[0].detach(), self.hidden[1].detach())
+        if self._use_autocast:
+            with torch.autocast(
+                device_type="cuda", dtype=self._autocast_dtype
+            ):
+                return self.__forward_body(x)
+        return self.__forward_body(x)
+
+    def __forward_body(self, x):
+        """Run the actual computation of the forward pass."""
         x = self.activation(self.first_layer(x))
 
-        if self.params.bidirection:
-            x, self.hidden = self.lstm_gru_layer(
-                x.view(
-                    self.batch_size,
-                    self.params.num_hidden_layers,
-                    self.params.layer_sizes[1],
-                ),
-                self.hidden,
-            )
-        else:
-            x, self.hidden = self.lstm_gru_layer(
-                x.view(
-                    self.batch_size,
-                    self.params.num_hidden_layers,
-                    self.params.layer_sizes[1],
-                ),
-                self.hidden,
-            )
+        # The recurrent layer was already constructed as bidirectional
+        # or unidirectional in __init__, so no branch is needed here.
+        x, self.hidden = self.lstm_gru_layer(
+            x.view(
+                self.batch_size,
+                self._num_hidden_layers,
+                self._lstm_input_size,
+            ),
+            self.hidden,
+        )
 
         x = x[:, -1, :]
         x = self.activation(x)
@@ -382,30 +679,24 @@ class LSTM(Network):
         Hidden state and cell state : torch.Tensor
             initialised to zeros.
         """
+        # Allocating with torch.zeros on the target device fuses the
+        # zero fill into the allocation and avoids copying the states
+        # over when the network is moved to the GPU.
+        device = self.params._configuration["device"]
         if self.params.bidirection:
-            h0 = torch.empty(
-                self.params.num_hidden_layers * 2,
-                self.mini_batch_size,
-                self.hidden_dim // 2,
-            )
-            c0 = torch.empty(
+            shape = (
                 self.params.num_hidden_layers * 2,
                 self.mini_batch_size,
                 self.hidden_dim // 2,
             )
         else:
-            h0 = torch.empty(
+            shape = (
                 self.params.num_hidden_layers,
                 self.mini_batch_size,
                 self.hidden_dim,
             )
-            c0 = torch.empty(
-                self.params.num_hidden_layers,
-                self.mini_batch_size,
-                self.hidden_dim,
-            )
-        h0.zero_()
-        c0.zero_()
+        h0 = torch.zeros(shape, device=device)
+        c0 = torch.zeros(shape, device=device)
 
         return (h0, c0)
 
@@ -423,6 +714,12 @@ class GRU(LSTM):
         # check for size for validate and train
         self.hidden = self.init_hidden()
 
+        # As in LSTM, a precomputed zero state assigned by reference in
+        # forward instead of a per-step zero fill.
+        self.register_buffer(
+            "_zero_h", torch.zeros_like(self.hidden), persistent=False
+        )
+
         # First Layer
         self.first_layer = nn.Linear(
             self.params.layer_sizes[0], self.params.layer_sizes[1]
@@ -445,12 +742,18 @@ class GRU(LSTM):
                 self.params.num_hidden_layers,
                 batch_first=True,
             )
-        self.activation = self.activation_mappings[
+        self.activation = _activation_mappings[
             self.params.layer_activations[0]
         ]()
 
-        if params.use_gpu:
-            self.to("cuda")
+        # See LSTM.__init__; the same hyperparameters are hot here.
+        self._no_hidden_state = bool(self.params.no_hidden_state)
+        self._num_hidden_layers = int(self.params.num_hidden_layers)
+        self._lstm_input_size = int(self.params.layer_sizes[1])
+
+        # Once everything is done, we can move the Network on the target
+        # device.
+        self._move_to_device()
 
     def forward(self, x):
         """
@@ -468,31 +771,31 @@ class GRU(LSTM):
         """
         self.batch_size = x.shape[0]
 
-        if self.params.no_hidden_state:
-            self.hidden = self.hidden[0].fill_(0.0)
+        if self._no_hidden_state:
+            self.hidden = self._zero_h
 
         self.hidden = self.hidden.detach()
 
+        if self._use_autocast:
+            with torch.autocast(
+                device_type="cuda", dtype=self._autocast_dtype
+            ):
+                return self.__forward_body(x)
+        return self.__forward_body(x)
+
+    def __forward_body(self, x):
+        """Run the actual computation of the forward pass."""
         x = self.activation(self.first_layer(x))
 
-        if self.params.bidirection:
-            x, self.hidden = self.lstm_gru_layer(
-                x.view(
-                    self.batch_size,
-                    self.params.num_hidden_layers,
-                    self.params.layer_sizes[1],
-                ),
-                self.hidden,
-            )
-        else:
-            x, self.hidden = self.lstm_gru_layer(
-                x.view(
-                    self.batch_size,
-                    self.params.num_hidden_layers,
-                    self.params.layer_sizes[1],
-                ),
-                self.hidden,
-            )
+        # As in LSTM, the directionality is fixed at construction time.
+        x, self.hidden = self.lstm_gru_layer(
+            x.view(
+                self.batch_size,
+                self._num_hidden_layers,
+                self._lstm_input_size,
+            ),
+            self.hidden,
+        )
 
         x = x[:, -1, :]
         x = self.activation(x)
@@ -508,19 +811,22 @@ class GRU(LSTM):
         Hidden state : torch.Tensor
             initialised to zeros.
         """
+        # See LSTM.init_hidden for why torch.zeros on the target device
+        # is used here.
+        device = self.params._configuration["device"]
         if self.params.bidirection:
-            h0 = torch.empty(
+            shape = (
                 self.params.num_hidden_layers * 2,
                 self.mini_batch_size,
                 self.hidden_dim // 2,
             )
         else:
-            h0 = torch.empty(
+            shape = (
                 self.params.num_hidden_layers,
                 self.mini_batch_size,
                 self.hidden_dim,
             )
-        h0.zero_()
+        h0 = torch.zeros(shape, device=device)
 
         return h0
 
@@ -551,9 +857,18 @@ class TransformerNet(Network):
                 min_verbosity=1,
             )
 
-        self.src_mask = None
+        # Causal masks, cached per sequence length so that variable
+        # batch sizes do not rebuild the mask every step.
+        self._src_mask_cache = {}
+        # Should the sqrt(d_model) embedding scaling of the original
+        # transformer ever be enabled, pass
+        # scale=math.sqrt(self.params.layer_sizes[0]) here; the scaling
+        # is folded into the stored encoding (see PositionalEncoding).
+        # The baseline never applied it, so it stays off.
         self.pos_encoder = PositionalEncoding(
-            self.params.layer_sizes[0], self.params.dropout
+            self.params.layer_sizes[0],
+            self.params.dropout,
+            device=self.params._configuration["device"],
         )
 
         encoder_layers = nn.TransformerEncoderLayer(
@@ -562,8 +877,12 @@ class TransformerNet(Network):
             self.params.layer_sizes[1],
             self.params.dropout,
         )
+        # enable_nested_tensor lets the encoder use the fused
+        # (BetterTransformer) fast path where the input permits it.
         self.transformer_encoder = nn.TransformerEncoder(
-            encoder_layers, self.params.num_hidden_layers
+            encoder_layers,
+            self.params.num_hidden_layers,
+            enable_nested_tensor=True,
         )
 
         self.decoder = nn.Linear(
@@ -574,10 +893,10 @@ class TransformerNet(Network):
 
         # Once everything is done, we can move the Network on the target
         # device.
-        self.to(self.params._configuration["device"])
+        self._move_to_device()
 
     @staticmethod
-    def generate_square_subsequent_mask(size):
+    def generate_square_subsequent_mask(size, device=None):
         """
         Generate a mask so that only the current / previous tokens are visible.
 
@@ -585,13 +904,15 @@ class TransformerNet(Network):
         ----------
         size: int
             size of the mask
+
+        device :
+            Torch device on which the mask is built. Building it there
+            directly avoids a host-to-device copy per rebuild.
         """
-        mask = (torch.triu(torch.ones(size, size)) == 1).transpose(0, 1)
-        mask = (
-            mask.float()
-            .masked_fill(mask == 0, float("-inf"))
-            .masked_fill(mask == 1, float(0.0))
-        )
+        # One in-place triu on a -inf filled tensor replaces the
+        # previous triu/compare/two-masked_fill sequence.
+        mask = torch.full((size, size), float("-inf"), device=device)
+        mask.triu_(1)
 
         return mask
 
@@ -607,18 +928,40 @@ class TransformerNet(Network):
 
     def forward(self, x):
         """Perform a forward pass through the network."""
-        if self.src_mask is None or self.src_mask.size(0) != x.size(0):
-            device = x.device
-            mask = self.generate_square_subsequent_mask(x.size(0)).to(device)
-            self.src_mask = mask
-
-        #        x = self.encoder(x) * math.sqrt(self.params.layer_sizes[0])
-        x = self.pos_encoder(x)
-        output = self.transformer_encoder(x, self.src_mask)
-        output = self.decoder(output)
+        size = x.size(0)
+        src_mask = self._src_mask_cache.get(size)
+        if src_mask is None or src_mask.device != x.device:
+            src_mask = self.generate_square_subsequent_mask(size, x.device)
+            self._src_mask_cache[size] = src_mask
+
+        if self._use_autocast:
+            with torch.autocast(
+                device_type="cuda", dtype=self._autocast_dtype
+            ):
+                output = self.__forward_body(x, src_mask)
+        else:
+            output = self.__forward_body(x, src_mask)
         output = output.squeeze(dim=1)
         return output
 
+    def __forward_body(self, x, src_mask):
+        """Run the actual computation of the forward pass."""
+        x = self.pos_encoder(x)
+        if x.is_cuda:
+            # Prefer the fused attention kernels, which never
+            # materialize the full attention matrix. The math kernel
+            # stays enabled as a fallback for head dimensions or dtypes
+            # the fused kernels do not support.
+            with torch.backends.cuda.sdp_kernel(
+                enable_flash=True,
+                enable_mem_efficient=True,
+                enable_math=True,
+            ):
+                output = self.transformer_encoder(x, src_mask)
+        else:
+            output = self.transformer_encoder(x, src_mask)
+        return self.decoder(output)
+
 
 class PositionalEncoding(nn.Module):
     """
@@ -634,31 +977,102 @@ class PositionalEncoding(nn.Module):
 
     max_len: int
         maximum length of the input sequence
+
+    device :
+        Torch device on which the encoding is built. If None, it is
+        built on the CPU and moved along with the network.
+
+    scale : float
+        Scale factor applied to the input embedding, as in the original
+        transformer (sqrt(d_model)). The factor is folded into the
+        stored encoding as x * scale + pe == scale * (x + pe / scale),
+        so forward needs no separate full-tensor multiply before the
+        add. Default: 1.0 (no scaling)
     """
 
-    def __init__(self, d_model, dropout=0.1, max_len=400):
+    def __init__(
+        self, d_model, dropout=0.1, max_len=400, device=None, scale=1.0
+    ):
         super(PositionalEncoding, self).__init__()
         self.dropout = nn.Dropout(p=dropout)
-
-        pe = torch.zeros(max_len, d_model)
-        position = torch.arange(0, max_len, dtype=torch.float).unsqueeze(1)
-
-        # Need to develop better form here.
+        self.scale = scale
+
+        # The encoding is built directly on the target device, so the
+        # buffer does not have to be copied over afterwards.
+        pe = torch.zeros(max_len, d_model, device=device)
+        position = torch.arange(
+            0, max_len, dtype=torch.float, device=device
+        ).unsqueeze(1)
+
+        # The frequencies of the even (sin) and odd (cos) channels are
+        # identical, so one vector suffices; for odd d_model the cos
+        # channels are just one entry shorter.
         div_term = torch.exp(
-            torch.arange(0, d_model, 2).float() * (-np.log(10000.0) / d_model)
-        )
-        div_term2 = torch.exp(
-            torch.arange(0, d_model - 1, 2).float()
-            * (-np.log(10000.0) / d_model)
+            torch.arange(0, d_model, 2, dtype=torch.float, device=device)
+            * (-math.log(10000.0) / d_model)
         )
-        pe[:, 0::2] = torch.sin(position * div_term)
-        pe[:, 1::2] = torch.cos(position * div_term2)
+        angles = position * div_term
+        pe[:, 0::2] = torch.sin(angles)
+        pe[:, 1::2] = torch.cos(angles[:, : d_model // 2])
         pe = pe.unsqueeze(0).transpose(0, 1)
-        self.register_buffer("pe", pe)
+        if scale != 1.0:
+            pe = pe / scale
+        # Non-persistent: the encoding is fully determined by the
+        # constructor arguments, so there is no point in writing the
+        # max_len x d_model buffer into every checkpoint.
+        self.register_buffer("pe", pe, persistent=False)
+
+        # Contiguous slices of pe per sequence length (see forward).
+        self._pe_slice_cache = {}
 
     def forward(self, x):
         """Perform a forward pass through the network."""
         # add extra dimension for batch_size
         x = x.unsqueeze(dim=1)
-        x = x + self.pe[: x.size(0), :]
+        size = x.size(0)
+        pe_slice = self._pe_slice_cache.get(size)
+        if pe_slice is None or pe_slice.device != x.device:
+            # The contiguous copy gives the broadcast add below a dense
+            # operand; it is made once per sequence length.
+            pe_slice = self.pe[:size].contiguous()
+            self._pe_slice_cache[size] = pe_slice
+        x = x + pe_slice
+        if self.scale != 1.0:
+            x = x * self.scale
         return self.dropout(x)
+
+
+# Mapping of nn_type values to network classes, shared by the
+# build_network factory and the Network dispatch.
+_network_types = {
+    "feed-forward": FeedForwardNet,
+    "transformer": TransformerNet,
+    "lstm": LSTM,
+    "gru": GRU,
+}
+
+
+def build_network(params: Parameters):
+    """
+    Build the neural network described by a parameters object.
+
+    This dispatches on params.network.nn_type via a plain lookup table,
+    without the __new__ machinery of the Network class, which keeps
+    construction transparent to pickling, static type checkers and
+    TorchScript.
+
+    Parameters
+    ----------
+    params : mala.common.parametes.Parameters
+        Parameters used to create this neural network.
+
+    Returns
+    -------
+    network : Network
+        The constructed network.
+    """
+    try:
+        network_class = _network_types[params.network.nn_type]
+    except KeyError:
+        raise Exception("Unsupported network architecture.")
+    return network_class(params)
@@ -5,7 +5,7 @@ from optuna import Trial, TrialPruned
 
 from mala.network.hyperparameter_optuna import HyperparameterOptuna
 from mala.network.hyperparameter_oat import HyperparameterOAT
-from mala.network.network import Network
+from mala.network.network import build_network
 from mala.network.trainer import Trainer
 from mala import printout
 
@@ -94,7 +94,7 @@ class ObjectiveBase:
         for i in range(
             0, self.params.hyperparameters.number_training_per_trial
         ):
-            test_network = Network(self.params)
+            test_network = build_network(self.params)
             test_trainer = Trainer(
                 self.params, test_network, self.data_handler
             )
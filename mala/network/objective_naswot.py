@@ -7,7 +7,7 @@ from torch.utils.data import DataLoader
 
 from mala.common.parameters import Parameters
 from mala.datahandling.data_handler import DataHandler
-from mala.network.network import Network
+from mala.network.network import Network, build_network
 from mala.network.objective_base import ObjectiveBase
 
 
@@ -69,7 +69,7 @@ class ObjectiveNASWOT(ObjectiveBase):
         for i in range(
             0, self.params.hyperparameters.number_training_per_trial
         ):
-            net = Network(self.params)
+            net = build_network(self.params)
             device = self.params.device
 
             # Load the batchesand get the jacobian.
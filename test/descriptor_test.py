@@ -11,6 +11,11 @@ from mala.datahandling.data_repo import data_path
 # Accuracy of test.
 accuracy_descriptors = 5e-8
 
+# Accuracy of the polynomial exp approximation in the python path. The
+# approximation truncates contributions with arguments beyond its
+# domain (exp(-12) ~ 6e-6) on top of the polynomial error itself.
+accuracy_fast_exp = 3e-5
+
 
 class TestDescriptorImplementation:
     """Tests the MALA python based descriptor implementation against LAMMPS."""
@@ -69,12 +74,14 @@ class TestDescriptorImplementation:
         bispectrum_calculator = mala.descriptors.AtomicDensity(params)
         atoms = read(os.path.join(data_path, "Be_snapshot3.out"))
 
+        # Both paths default to float32 now; the tight tolerances below
+        # predate that, so double precision is requested explicitly.
         descriptors, ngrid = bispectrum_calculator.calculate_from_atoms(
-            atoms=atoms, grid_dimensions=[18, 18, 27]
+            atoms=atoms, grid_dimensions=[18, 18, 27], use_fp64=True
         )
         params.use_lammps = False
         descriptors_py, ngrid = bispectrum_calculator.calculate_from_atoms(
-            atoms=atoms, grid_dimensions=[18, 18, 27]
+            atoms=atoms, grid_dimensions=[18, 18, 27], use_fp64=True
         )
 
         assert (
@@ -97,3 +104,30 @@ class TestDescriptorImplementation:
             )
             < accuracy_descriptors
         )
+
+    @pytest.mark.skipif(
+        importlib.util.find_spec("numba") is None,
+        reason="Numba is currently not part of the pipeline.",
+    )
+    def test_gaussian_fast_exp(self):
+        """Compare the approximated-exp Gaussian path with the exact one."""
+        params = mala.Parameters()
+        params.use_lammps = False
+        params.descriptors.atomic_density_cutoff = 4.67637
+
+        gaussian_calculator = mala.descriptors.AtomicDensity(params)
+        atoms = read(os.path.join(data_path, "Be_snapshot3.out"))
+
+        descriptors, ngrid = gaussian_calculator.calculate_from_atoms(
+            atoms=atoms, grid_dimensions=[18, 18, 27]
+        )
+        descriptors_fast, ngrid = gaussian_calculator.calculate_from_atoms(
+            atoms=atoms, grid_dimensions=[18, 18, 27], use_fast_exp=True
+        )
+
+        assert (
+            np.max(
+                np.abs(descriptors_fast[:, :, :, 3] - descriptors[:, :, :, 3])
+            )
+            < accuracy_fast_exp
+        )
@@ -7,6 +7,18 @@ import runpy
 import pytest
 
 
+@pytest.fixture(scope="session", autouse=True)
+def warm_module_cache():
+    """
+    Import mala once for the whole session.
+
+    Each example is executed via runpy.run_path in a fresh namespace,
+    but the heavy imports (torch etc.) stay warm in sys.modules, so
+    only the first example pays the import cost.
+    """
+    importlib.import_module("mala")
+
+
 @pytest.mark.examples
 class TestExamples:
     dir_path = os.path.dirname(__file__)
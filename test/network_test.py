@@ -0,0 +1,138 @@
+"""Test the optional network construction and inference settings."""
+
+import mala
+import numpy as np
+import pytest
+import torch
+
+# Accuracy for comparing forward passes of equivalent networks.
+accuracy_forward = 1e-7
+
+
+class TestNetworkOptions:
+    """
+    Tests the optional switches in ParametersNetwork.
+
+    All tests run on the CPU and use feed-forward networks with a fixed
+    seed, so networks built with the same layer layout have identical
+    weights and their predictions can be compared directly.
+    """
+
+    @staticmethod
+    def __build_network(seed=1234, **network_settings):
+        test_parameters = mala.Parameters()
+        test_parameters.manual_seed = seed
+        test_parameters.network.layer_sizes = [4, 10, 10, 10, 3]
+        test_parameters.network.layer_activations = ["ReLU"]
+        for name, setting in network_settings.items():
+            setattr(test_parameters.network, name, setting)
+        return mala.Network(test_parameters)
+
+    @staticmethod
+    def __example_input():
+        torch.manual_seed(4321)
+        return torch.rand(7, 4)
+
+    def test_use_jit(self):
+        """Test that scripted networks predict like eager ones."""
+        test_input = self.__example_input()
+        reference = self.__build_network().do_prediction(test_input)
+        scripted = self.__build_network(use_jit=True).do_prediction(test_input)
+        assert np.allclose(
+            reference.numpy(), scripted.numpy(), atol=accuracy_forward
+        )
+
+    def test_fused_layers(self):
+        """
+        Test networks built from fused linear/activation blocks.
+
+        The fused blocks consume the seeded RNG in the same order as the
+        separate layers, so the predictions have to match exactly. They
+        also have to stay scriptable.
+        """
+        test_input = self.__example_input()
+        reference = self.__build_network().do_prediction(test_input)
+        fused = self.__build_network(use_fused_layers=True).do_prediction(
+            test_input
+        )
+        assert np.allclose(
+            reference.numpy(), fused.numpy(), atol=accuracy_forward
+        )
+
+        fused_scripted = self.__build_network(
+            use_fused_layers=True, use_jit=True
+        ).do_prediction(test_input)
+        assert np.allclose(
+            reference.numpy(), fused_scripted.numpy(), atol=accuracy_forward
+        )
+
+    def test_batched_layers(self):
+        """
+        Test networks with stacked equal-width layer runs.
+
+        The two hidden 10x10 layers have to be collapsed into one
+        stacked (2, 10, 10) parameter, and loading a saved network into
+        a freshly (and differently) initialized one has to reproduce its
+        predictions. The stacked block also has to stay scriptable.
+        """
+        test_input = self.__example_input()
+        test_network = self.__build_network(use_batched_layers=True)
+        assert test_network.state_dict()["layers.2.weight"].shape == (
+            2,
+            10,
+            10,
+        )
+        test_output = test_network.do_prediction(test_input)
+        assert test_output.shape == (7, 3)
+
+        reloaded_network = self.__build_network(
+            seed=5678, use_batched_layers=True
+        )
+        reloaded_network.load_state_dict(test_network.state_dict())
+        reloaded_output = reloaded_network.do_prediction(test_input)
+        assert np.allclose(
+            test_output.numpy(), reloaded_output.numpy(), atol=0.0
+        )
+
+        scripted_output = self.__build_network(
+            use_batched_layers=True, use_jit=True
+        ).do_prediction(test_input)
+        assert np.allclose(
+            test_output.numpy(),
+            scripted_output.numpy(),
+            atol=accuracy_forward,
+        )
+
+    def test_inplace_activations(self):
+        """Test that disabling in-place activations changes nothing."""
+        test_input = self.__example_input()
+        inplace = self.__build_network().do_prediction(test_input)
+        out_of_place = self.__build_network(
+            inplace_activations=False
+        ).do_prediction(test_input)
+        assert np.allclose(
+            inplace.numpy(), out_of_place.numpy(), atol=accuracy_forward
+        )
+
+    def test_precision_fp32(self):
+        """Test that the fp32 default skips autocast on the CPU."""
+        test_network = self.__build_network()
+        assert test_network._use_autocast is False
+        test_output = test_network.do_prediction(self.__example_input())
+        assert test_output.dtype == torch.float32
+
+    @pytest.mark.skipif(
+        not hasattr(torch, "compile"),
+        reason="No torch.compile in this torch version, skipping this "
+        "test.",
+    )
+    def test_use_compile(self):
+        """Test that compiled networks predict like eager ones."""
+        test_input = self.__example_input()
+        reference = self.__build_network().do_prediction(test_input)
+        compiled = self.__build_network(use_compile=True).do_prediction(
+            test_input
+        )
+        assert np.allclose(
+            reference.numpy(), compiled.numpy(), atol=accuracy_forward
+        )